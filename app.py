@@ -77,6 +77,13 @@ def format_financial_data(df, is_ratios=False):
     
     return formatted_df
 
+# Shared by every session, and each result keeps its filing's parsed soup alive through the
+# table tags, so only a few recent filings are held and none for longer than an hour
+@st.cache_resource(show_spinner=False, max_entries=4, ttl="1h")
+def analyze_filing(html_content, form_type):
+    """Process a filing once per document; reruns reuse the analyzed result."""
+    return process_html(html_content, form_type)
+
 st.set_page_config(page_title="SEC Filing Analyzer", layout="wide")
 
 st.title("SEC Filing Analyzer")
@@ -159,7 +166,7 @@ if st.button("Get Filing"):
             
             # Download and process the filing
             html_content = download_filing(ticker, form_type)
-            result = process_html(html_content, form_type)
+            result = analyze_filing(html_content, form_type)
             
             # Display risks analysis
             st.header("Risk Analysis")
@@ -1,4 +1,5 @@
 from financetoolkit import Toolkit
+import numpy as np
 import pandas as pd
 
 
@@ -60,56 +61,50 @@ def get_financial_ratios(ticker: str) -> pd.DataFrame:
     all_ratios = pd.concat([efficiency, liquidity, profitability, solvency, valuation])
     return all_ratios
 
-def analyze_balance_sheet_yoy(ticker: str) -> pd.DataFrame:
+def _calculate_yoy_changes(statement: pd.DataFrame) -> pd.DataFrame:
     """
-    Analyze year-over-year changes in balance sheet metrics.
+    Calculate year-over-year percentage changes for every metric in a statement.
     
     Args:
-        ticker: Stock ticker symbol
+        statement: Financial statement with metrics as rows and years as columns
         
     Returns:
-        DataFrame containing YoY changes for balance sheet metrics
+        DataFrame with year pairs as rows and metrics as columns, formatted as percentages
     """
-    # Get balance sheet data
-    balance_sheet, _, _ = get_financial_metrics(ticker)
+    # Get all available years, most recent first
+    years = sorted(statement.columns, reverse=True)
     
-    # Calculate year-over-year changes
-    yoy_changes = pd.DataFrame()
-    
-    # Get all available years
-    years = sorted(balance_sheet.columns, reverse=True)
-    
-    # Calculate changes for each metric
-    for metric in balance_sheet.index:
-        values = balance_sheet.loc[metric]
-        changes = []
-        
-        # Calculate percentage change for each year compared to previous year
-        for i in range(len(years)-1):
-            current_year = years[i]
-            previous_year = years[i+1]
-            
-            current_value = values[current_year]
-            previous_value = values[previous_year]
-            
-            if previous_value != 0 and not pd.isna(current_value) and not pd.isna(previous_value):
-                change = ((current_value - previous_value) / abs(previous_value)) * 100
-                changes.append(change)
-            else:
-                changes.append(None)
-        
-        # Add the changes to the DataFrame
-        yoy_changes[metric] = changes
+    # Compare each year with the one before it for all metrics at once
+    values = statement[years].to_numpy(dtype=float)
+    current_values, previous_values = values[:, :-1], values[:, 1:]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        changes = (current_values - previous_values) / np.abs(previous_values) * 100
+    changes[previous_values == 0] = np.nan
     
     # Set the index to be the year pairs (e.g., "2023 vs 2022")
     year_pairs = [f"{years[i]} vs {years[i+1]}" for i in range(len(years)-1)]
-    yoy_changes.index = year_pairs
+    yoy_changes = pd.DataFrame(changes.T, index=year_pairs, columns=list(statement.index))
     
     # Format the changes as percentages
     yoy_changes = yoy_changes.applymap(lambda x: f"{x:.2f}%" if pd.notna(x) else "N/A")
     
     return yoy_changes
 
+def analyze_balance_sheet_yoy(ticker: str) -> pd.DataFrame:
+    """
+    Analyze year-over-year changes in balance sheet metrics.
+    
+    Args:
+        ticker: Stock ticker symbol
+        
+    Returns:
+        DataFrame containing YoY changes for balance sheet metrics
+    """
+    # Get balance sheet data
+    balance_sheet, _, _ = get_financial_metrics(ticker)
+    
+    return _calculate_yoy_changes(balance_sheet)
+
 def format_yoy_changes(df: pd.DataFrame) -> pd.DataFrame:
     """
     Format year-over-year changes DataFrame for display.
@@ -146,42 +141,7 @@ def analyze_income_statement_yoy(ticker: str) -> pd.DataFrame:
     # Get income statement data
     _, income_statement, _ = get_financial_metrics(ticker)
     
-    # Calculate year-over-year changes
-    yoy_changes = pd.DataFrame()
-    
-    # Get all available years
-    years = sorted(income_statement.columns, reverse=True)
-    
-    # Calculate changes for each metric
-    for metric in income_statement.index:
-        values = income_statement.loc[metric]
-        changes = []
-        
-        # Calculate percentage change for each year compared to previous year
-        for i in range(len(years)-1):
-            current_year = years[i]
-            previous_year = years[i+1]
-            
-            current_value = values[current_year]
-            previous_value = values[previous_year]
-            
-            if previous_value != 0 and not pd.isna(current_value) and not pd.isna(previous_value):
-                change = ((current_value - previous_value) / abs(previous_value)) * 100
-                changes.append(change)
-            else:
-                changes.append(None)
-        
-        # Add the changes to the DataFrame
-        yoy_changes[metric] = changes
-    
-    # Set the index to be the year pairs (e.g., "2023 vs 2022")
-    year_pairs = [f"{years[i]} vs {years[i+1]}" for i in range(len(years)-1)]
-    yoy_changes.index = year_pairs
-    
-    # Format the changes as percentages
-    yoy_changes = yoy_changes.applymap(lambda x: f"{x:.2f}%" if pd.notna(x) else "N/A")
-    
-    return yoy_changes
+    return _calculate_yoy_changes(income_statement)
 
 def analyze_cash_flow_yoy(ticker: str) -> pd.DataFrame:
     """
@@ -196,42 +156,7 @@ def analyze_cash_flow_yoy(ticker: str) -> pd.DataFrame:
     # Get cash flow data
     _, _, cash_flow = get_financial_metrics(ticker)
     
-    # Calculate year-over-year changes
-    yoy_changes = pd.DataFrame()
-    
-    # Get all available years
-    years = sorted(cash_flow.columns, reverse=True)
-    
-    # Calculate changes for each metric
-    for metric in cash_flow.index:
-        values = cash_flow.loc[metric]
-        changes = []
-        
-        # Calculate percentage change for each year compared to previous year
-        for i in range(len(years)-1):
-            current_year = years[i]
-            previous_year = years[i+1]
-            
-            current_value = values[current_year]
-            previous_value = values[previous_year]
-            
-            if previous_value != 0 and not pd.isna(current_value) and not pd.isna(previous_value):
-                change = ((current_value - previous_value) / abs(previous_value)) * 100
-                changes.append(change)
-            else:
-                changes.append(None)
-        
-        # Add the changes to the DataFrame
-        yoy_changes[metric] = changes
-    
-    # Set the index to be the year pairs (e.g., "2023 vs 2022")
-    year_pairs = [f"{years[i]} vs {years[i+1]}" for i in range(len(years)-1)]
-    yoy_changes.index = year_pairs
-    
-    # Format the changes as percentages
-    yoy_changes = yoy_changes.applymap(lambda x: f"{x:.2f}%" if pd.notna(x) else "N/A")
-    
-    return yoy_changes
+    return _calculate_yoy_changes(cash_flow)
 
 """
 Liquidity Ratios: Remove Working Capital
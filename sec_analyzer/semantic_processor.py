@@ -4,11 +4,22 @@ Module for processing SEC filings into sections and extracting key information.
 
 import re
 import logging
-from bs4 import BeautifulSoup, Tag
-from typing import Dict, List, Optional, Any, Tuple
+from bisect import bisect_right
+from collections import Counter, defaultdict
+from functools import lru_cache
+from itertools import islice
+from bs4 import BeautifulSoup, SoupStrainer, Tag
+from typing import Dict, List, Optional, Any, Tuple, Iterator
 from .types import RedFlag, SemanticElement
 import streamlit as st
 from textblob import TextBlob
+import nltk
+from nltk.corpus import stopwords
+
+try:
+    import ahocorasick
+except ImportError:  # Optional accelerator for the risk term scan
+    ahocorasick = None
 
 # Configure logging
 logging.basicConfig(
@@ -17,18 +28,377 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+def _ensure_nltk_resources() -> None:
+    """Download the NLTK resources used by the focus analysis if they are missing."""
+    try:
+        nltk.data.find('corpora/stopwords')
+    except LookupError:
+        nltk.download('stopwords')
+
+# Resolve NLTK resources once per process rather than on every analysis
+_ensure_nltk_resources()
+_STOP_WORDS = frozenset(stopwords.words('english'))
+
+# Word tokens in already-lowercased text. [^\W_] is any Unicode letter or digit, so words like
+# "nestlé" stay whole. Runs joined by '-', ',' or '.' (e.g. "10-k", "391,035") stay a single
+# token so the isalnum filter drops them, as it did for word_tokenize output.
+_TOKEN_RE = re.compile(r'[^\W_]+(?:[-,.][^\W_]+)*')
+# Elements joined per tokenizer call when counting focus terms
+_FOCUS_CHUNK_SIZE = 256
+
+# Tags that become semantic elements; nothing outside them is needed from the parse
+_HEADING_TAGS = frozenset({'h1', 'h2', 'h3', 'h4', 'h5', 'h6'})
+_SEMANTIC_TAGS = _HEADING_TAGS | {'p', 'div', 'table'}
+_SEMANTIC_STRAINER = SoupStrainer(sorted(_SEMANTIC_TAGS))
+
+# Document structure patterns
+_TOC_RE = re.compile(r'table\s+of\s+contents', re.IGNORECASE)
+_PART_RE = re.compile(r'^part\s+[iIvV]+$', re.IGNORECASE)
+_ITEM_RE = re.compile(r'^item\s+(\d+[A-Z]?)\s*\.?\s*(.*)$', re.IGNORECASE)
+_NUM_ONLY_RE = re.compile(r'^\d+[A-Z]?\s*$')
+_NUM_COMMA_RE = re.compile(r'^\d+[A-Z]?\s*,\s*\d+[A-Z]?\s*$')
+
+# Boilerplate that is left out of section content
+_CONTENT_SKIP_MARKERS = (
+    'forward-looking statement',
+    'table of contents',
+    'documents incorporated by reference',
+    'part ii',
+    'part iii',
+    'part iv'
+)
+
+# Item number inside a TOC title, and the start of the next "Item X." section header
+_ITEM_NUMBER_RE = re.compile(r'Item\s+(\d+[A-Z]?)')
+_NEXT_SECTION_RE = re.compile(r'Item\s+\d+[A-Z]?\s*\.', re.IGNORECASE | re.MULTILINE)
+
+# Capitalized title-like lines, with or without trailing punctuation
+_SUBSECTION_RE = re.compile(r'^[A-Z][A-Za-z\s]{2,}(?:[.:]|\s*$)')
+
+# Characters dropped when normalizing risk contexts for duplicate checks
+_PUNCT_RE = re.compile(r'[^\w\s\.]')
+_ASCII_PUNCT_TABLE = str.maketrans(
+    '', '', ''.join(ch for ch in map(chr, range(128)) if _PUNCT_RE.match(ch))
+)
+
+# Substrings that escalate a flagged risk to High severity
+_SEVERITY_INDICATORS = (
+    'material', 'significant', 'substantial', 'major',
+    'critical', 'important', 'key', 'essential', 'fundamental',
+    'adverse', 'serious', 'severe', 'material adverse effect',
+    'could', 'may', 'might', 'will', 'would', 'should',
+    'risk', 'uncertainty', 'challenge', 'threat', 'concern',
+    'issue', 'problem', 'difficulty', 'obstacle', 'barrier'
+)
+
+# Define investor-relevant risk categories with specific terms and context requirements
+_RISK_CATEGORIES = {
+    'Major Lawsuits': {
+        'terms': (
+            # Active litigation
+            'lawsuit filed', 'litigation pending', 'ongoing litigation',
+            'current lawsuit', 'active litigation', 'pending lawsuit',
+            # Specific types
+            'securities class action filed', 'shareholder derivative filed',
+            'antitrust lawsuit filed', 'patent infringement filed',
+            'regulatory enforcement action', 'sec enforcement proceeding',
+            # Original terms
+            'securities class action', 'securities fraud', 'shareholder class action',
+            'stockholder derivative', 'securities violation', 'insider trading',
+            'securities litigation', 'securities claim', 'securities lawsuit',
+            'sec investigation', 'sec enforcement', 'regulatory investigation',
+            'regulatory action', 'enforcement proceeding', 'regulatory violation',
+            'compliance issue', 'regulatory penalty', 'regulatory fine',
+            'regulatory settlement', 'regulatory order', 'regulatory finding',
+            'antitrust investigation', 'antitrust lawsuit', 'monopoly',
+            'anti-competitive', 'price fixing', 'market allocation',
+            'antitrust violation', 'competition law', 'market power',
+            'material litigation', 'significant lawsuit', 'major legal proceeding',
+            'substantial claim', 'material claim', 'material legal matter',
+            'legal proceeding', 'lawsuit', 'litigation', 'legal action',
+            'class action', 'breach of contract', 'dispute', 'arbitration'
+        ),
+        'required_context': (
+            'filed', 'pending', 'ongoing', 'current', 'active',
+            'material', 'significant', 'substantial', 'major',
+            'damages', 'penalty', 'fine', 'settlement', 'judgment',
+            'adverse', 'negative', 'unfavorable', 'damages',
+            'penalty', 'fine', 'settlement', 'judgment',
+            'could', 'may', 'might', 'will', 'would', 'should'
+        )
+    },
+    'Auditor Opinions': {
+        'terms': (
+            # Adverse opinions
+            'adverse opinion', 'qualified opinion', 'going concern',
+            'material weakness', 'significant deficiency', 'internal control',
+            'accounting irregularity', 'restatement', 'material misstatement',
+            'audit committee', 'independent auditor', 'audit opinion',
+            'audit report', 'auditor resignation', 'auditor change',
+            'internal control', 'financial reporting', 'accounting policy',
+            'accounting estimate', 'accounting principle', 'accounting standard',
+            'financial statement', 'financial reporting', 'financial control'
+        ),
+        'required_context': (
+            'adverse', 'qualified', 'material weakness', 'significant deficiency',
+            'going concern', 'restatement', 'irregularity', 'resignation',
+            'change', 'replacement', 'termination', 'dismissal',
+            'could', 'may', 'might', 'will', 'would', 'should'
+        )
+    },
+    'Management Changes': {
+        'terms': (
+            # Executive departures
+            'ceo departure', 'cfo departure', 'chief executive officer',
+            'chief financial officer', 'executive officer', 'key executive',
+            'executive departure', 'executive resignation', 'executive termination',
+            'executive change', 'executive transition', 'executive succession',
+            # Board changes
+            'board member', 'director resignation', 'board resignation',
+            'independent director', 'audit committee member', 'board change',
+            'board transition', 'board succession', 'board departure',
+            # Management structure
+            'management change', 'leadership change', 'organizational change',
+            'reporting structure', 'management team', 'executive team',
+            'management transition', 'leadership transition', 'organizational transition',
+            # Termination indicators
+            'termination', 'resignation', 'departure', 'separation',
+            'for cause', 'without cause', 'good reason', 'constructive termination'
+        ),
+        'required_context': (
+            'resignation', 'departure', 'termination', 'separation',
+            'change', 'replacement', 'succession', 'transition',
+            'interim', 'temporary', 'acting', 'permanent',
+            'could', 'may', 'might', 'will', 'would', 'should'
+        )
+    },
+    'Cybersecurity & Data Privacy': {
+        'terms': (
+            # Security incidents
+            'data breach', 'security breach', 'cyber attack',
+            'hacking incident', 'unauthorized access', 'data theft',
+            # Privacy issues
+            'privacy violation', 'data privacy', 'personal information',
+            'customer data', 'user data', 'member data',
+            # System issues
+            'system failure', 'service disruption', 'outage',
+            'system compromise', 'security vulnerability'
+        ),
+        'required_context': (
+            'material', 'significant', 'substantial', 'major',
+            'adverse', 'negative', 'unfavorable', 'damage',
+            'impact', 'effect', 'consequence', 'result'
+        )
+    },
+    'Related Party Transactions': {
+        'terms': (
+            # Explicit relationships
+            'related party transaction', 'related person transaction',
+            'insider transaction', 'executive transaction',
+            'director transaction', 'board member transaction',
+            # Specific relationships
+            'family member', 'immediate family', 'close family',
+            'executive', 'director', 'officer', 'board member',
+            'key employee', 'principal shareholder',
+            # Original terms
+            'affiliate transaction', 'insider transaction', 'executive transaction',
+            'director transaction', 'board member transaction', 'officer transaction',
+            'related party', 'related person', 'affiliate', 'insider',
+            'business relationship', 'personal relationship', 'financial relationship',
+            'family relationship', 'personal interest', 'business interest',
+            'purchase', 'sale', 'lease', 'loan', 'guarantee',
+            'indemnification', 'compensation', 'benefit', 'arrangement',
+            'transaction', 'agreement', 'contract', 'arrangement'
+        ),
+        'required_context': (
+            'material', 'significant', 'substantial', 'major',
+            'unusual', 'non-arm\'s length', 'conflict of interest',
+            'independence', 'approval', 'review', 'disclosure',
+            'transaction', 'agreement', 'contract', 'arrangement',
+            'could', 'may', 'might', 'will', 'would', 'should',
+            'related party', 'related person', 'affiliate', 'insider',
+            'family member', 'executive', 'director', 'officer',
+            'board member', 'key employee', 'principal shareholder'
+        )
+    },
+    'Financial Performance': {
+        'terms': (
+            # Revenue issues
+            'revenue decline', 'sales decline', 'profit decline',
+            'earnings decline', 'income decline', 'margin erosion',
+            # Financial problems
+            'loss', 'deficit', 'impairment', 'write-down',
+            'write-off', 'restructuring charge', 'goodwill impairment',
+            # Liquidity issues
+            'liquidity', 'working capital', 'cash flow',
+            'debt covenant', 'credit facility', 'borrowing base',
+            # Original terms
+            'profit margin', 'gross margin', 'operating margin',
+            'revenue', 'sales', 'profit', 'earnings', 'income',
+            'margin', 'profitability', 'earnings per share',
+            'cash', 'liquidity', 'working capital', 'capital',
+            'debt', 'credit', 'borrowing', 'financing',
+            'material change', 'significant change', 'substantial change',
+            'material impact', 'significant impact', 'substantial impact',
+            'change', 'impact', 'effect', 'influence', 'consequence',
+            'impairment', 'write-down', 'write-off', 'restructuring'
+        ),
+        'required_context': (
+            'material', 'significant', 'substantial', 'major',
+            'adverse', 'negative', 'unfavorable', 'decline',
+            'decrease', 'reduction', 'deterioration', 'weakening',
+            'percent', '%', 'million', 'billion', 'dollar',
+            'could', 'may', 'might', 'will', 'would', 'should'
+        )
+    },
+    'Competition': {
+        'terms': (
+            # Market position
+            'market share loss', 'competitive position loss',
+            'market position loss', 'competitive disadvantage',
+            # Customer impact
+            'customer loss', 'customer defection', 'customer retention',
+            'customer concentration', 'key customer loss',
+            # Product issues
+            'product obsolescence', 'technological change',
+            'disruptive technology', 'new entrant', 'substitute product',
+            # Original terms
+            'market share', 'competitive position', 'market position',
+            'competitive pressure', 'pricing pressure', 'market competition',
+            'market', 'competition', 'competitive', 'pricing',
+            'customer', 'client', 'buyer', 'purchaser', 'consumer',
+            'customer base', 'customer relationship', 'customer service',
+            'product', 'technology', 'innovation', 'development',
+            'research', 'r&d', 'patent', 'intellectual property',
+            'industry change', 'market change', 'competitive landscape',
+            'competitive environment', 'market disruption', 'industry disruption',
+            'industry', 'market', 'sector', 'business', 'commercial'
+        ),
+        'required_context': (
+            'material', 'significant', 'substantial', 'major',
+            'adverse', 'negative', 'unfavorable', 'decline',
+            'decrease', 'reduction', 'deterioration', 'weakening',
+            'competitor', 'competition', 'competitive', 'market',
+            'could', 'may', 'might', 'will', 'would', 'should'
+        )
+    }
+}
+
+# Define focus areas and their keywords
+_FOCUS_AREAS = {
+    'Innovation': ('research', 'development', 'innovation', 'patent', 'technology', 'r&d'),
+    'Growth': ('growth', 'expansion', 'acquisition', 'market share', 'new market'),
+    'Efficiency': ('efficiency', 'cost reduction', 'optimization', 'productivity'),
+    'Sustainability': ('sustainability', 'environmental', 'green', 'carbon', 'renewable'),
+    'Customer Focus': ('customer', 'user', 'experience', 'satisfaction', 'service'),
+    'Financial': ('profit', 'margin', 'revenue', 'earnings', 'dividend', 'shareholder'),
+    'Risk': ('risk', 'uncertainty', 'challenge', 'threat', 'competition'),
+    'Regulatory': ('regulation', 'compliance', 'legal', 'policy', 'government')
+}
+
+# Focus keywords that are not a single word token ('market share', 'r&d'), matched as whole
+# words with any whitespace between their parts. The match sits in a lookahead so findall
+# also reports overlapping hits, e.g. both phrases in "new market share".
+_FOCUS_PHRASE_RE = re.compile(
+    r'(?=(?<![^\W_])('
+    + '|'.join(
+        r'\s+'.join(map(re.escape, keyword.split()))
+        for keywords in _FOCUS_AREAS.values()
+        for keyword in keywords
+        if not keyword.isalnum()
+    )
+    + r')(?![^\W_]))'
+)
+
+def _build_risk_word_automaton():
+    """Build an Aho-Corasick automaton over every risk term and required context word."""
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for config in _RISK_CATEGORIES.values():
+        for word in config['terms'] + config['required_context']:
+            automaton.add_word(word, word)
+    automaton.make_automaton()
+    return automaton
+
+_RISK_WORD_AUTOMATON = _build_risk_word_automaton()
+
+# (category, terms, required_context) rows in priority order, unpacked once for the matcher
+_RISK_CATEGORY_TABLE = tuple(
+    (category, config['terms'], config['required_context'])
+    for category, config in _RISK_CATEGORIES.items()
+)
+
+def _find_risk_words(text: str):
+    """Return the risk terms and context words present in the lowercased text.
+    
+    With pyahocorasick installed this is the set of every (possibly overlapping) match, found in
+    one pass over the text. Otherwise the text itself is returned, so `word in result` falls back
+    to a substring check with the same answer.
+    """
+    if _RISK_WORD_AUTOMATON is None:
+        return text
+    return {word for _, word in _RISK_WORD_AUTOMATON.iter(text)}
+
+def _is_navigation_text(text_lower: str) -> bool:
+    """Check for table-of-contents and page navigation markers."""
+    # Both page links contain 'page', so one substring test rules them out for most text
+    return 'table of contents' in text_lower or (
+        'page' in text_lower and ('next page' in text_lower or 'previous page' in text_lower)
+    )
+
+def _is_page_chrome(text_lower: str) -> bool:
+    """Check for navigation links, running form headers and page separators."""
+    # 'page' covers the next/previous page links and 'form ' gates the form headers
+    return (
+        'page' in text_lower or '|' in text_lower or 'table of contents' in text_lower or
+        ('form ' in text_lower and (
+            'form 10-k' in text_lower or 'form 10-q' in text_lower or 'form 8-k' in text_lower
+        ))
+    )
+
+def _match_risk_category(text: str) -> Optional[Tuple[str, str]]:
+    """Return the first (category, term) whose term and required context both appear in the text."""
+    present = _find_risk_words(text)
+    if not present:
+        return None
+    
+    for category, terms, required_context in _RISK_CATEGORY_TABLE:
+        # Only the first matching term of a category is ever reported
+        term = next((term for term in terms if term in present), None)
+        if term is None:
+            continue
+        
+        # Check for required context terms
+        if any(context_term in present for context_term in required_context):
+            return category, term
+    return None
+
+def _normalize_text(text_lower: str) -> str:
+    """Normalize lowercased text for comparison by removing extra whitespace and punctuation."""
+    text = ' '.join(text_lower.split())
+    # str.translate is much faster than the regex and agrees with it on ASCII; curly
+    # quotes, dashes and other non-ASCII punctuation still go through the regex
+    if text.isascii():
+        return text.translate(_ASCII_PUNCT_TABLE)
+    text = _PUNCT_RE.sub('', text)
+    return text
+
+def _sentiment_polarity(text: str) -> float:
+    """Return the TextBlob polarity of the text."""
+    return TextBlob(text).sentiment.polarity
+
 def parse_table_of_contents(elements: List['SemanticElement']) -> List[Dict]:
     """Parse the table of contents and document content to create a hierarchical structure."""
     logger.info("Starting table of contents parsing")
     structure = []
     
     # Find the table of contents section
-    toc_pattern = re.compile(r'table\s+of\s+contents', re.IGNORECASE)
     toc_section = None
     
     # Look for the table of contents in various possible locations
     for element in elements:
-        if element.type in ['heading', 'text'] and toc_pattern.search(element.text):
+        if element.type in ['heading', 'text'] and _TOC_RE.search(element.text):
             toc_section = element
             break
     
@@ -44,8 +414,9 @@ def parse_table_of_contents(elements: List['SemanticElement']) -> List[Dict]:
     for element in elements:
         text = element.text.strip()
         
-        # Check if this is a part header
-        if re.match(r'^part\s+[iIvV]+$', text, re.IGNORECASE):
+        # Check if this is a part header; headers are rare, so a prefix test screens out
+        # most elements before the part and item regexes run
+        if element.text_lower.startswith('part') and _PART_RE.match(text):
             # If we have a current part, add it to the structure
             if current_part and current_items:
                 structure.append({
@@ -57,7 +428,7 @@ def parse_table_of_contents(elements: List['SemanticElement']) -> List[Dict]:
             continue
         
         # Check if this is an item
-        item_match = re.match(r'^item\s+(\d+[A-Z]?)\s*\.?\s*(.*)$', text, re.IGNORECASE)
+        item_match = _ITEM_RE.match(text) if element.text_lower.startswith('item') else None
         if item_match:
             item_number = item_match.group(1)
             item_title = item_match.group(2).strip()
@@ -75,12 +446,13 @@ def parse_table_of_contents(elements: List['SemanticElement']) -> List[Dict]:
                     current_items = []
                 continue
             
-            # Skip items with no title or just numbers
-            if not item_title or re.match(r'^\d+[A-Z]?\s*$', item_title):
+            # Skip items with no title
+            if not item_title:
                 continue
             
-            # Skip items that are just numbers separated by commas
-            if re.match(r'^\d+[A-Z]?\s*,\s*\d+[A-Z]?\s*$', item_title):
+            # Skip items that are just numbers, optionally separated by commas; both
+            # forms start with a digit, so ordinary titles never reach the regexes
+            if item_title[0].isdigit() and (_NUM_ONLY_RE.match(item_title) or _NUM_COMMA_RE.match(item_title)):
                 continue
             
             # Add the item with its full title
@@ -89,8 +461,8 @@ def parse_table_of_contents(elements: List['SemanticElement']) -> List[Dict]:
                 'item_number': item_number
             })
         
-        # Stop if we hit the next major section
-        if element.type == 'heading' and not re.match(r'^part\s+[iIvV]+$', text, re.IGNORECASE):
+        # Stop if we hit the next major section (part headers were handled above)
+        if element.type == 'heading':
             break
     
     # Add the last part if it exists
@@ -107,35 +479,19 @@ def parse_table_of_contents(elements: List['SemanticElement']) -> List[Dict]:
             item['content'] = section_content['content']
             item['subsections'] = section_content['subsections']
     
-    logger.info(f"Completed table of contents parsing. Created structure with {len(structure)} parts")
+    logger.info("Completed table of contents parsing. Created structure with %d parts", len(structure))
     return structure
 
 def process_html(html_content: str, form_type: str = '10-K') -> Dict[str, Any]:
     """Process HTML content and extract key information."""
     logger.info("Starting HTML processing")
     
-    # Parse HTML
-    soup = BeautifulSoup(html_content, 'html.parser')
+    # Parse HTML, keeping only the semantic tags. html.parser nests block tags found inside
+    # a <p> as EDGAR markup intends, where lxml would close the <p> early and split its text.
+    soup = BeautifulSoup(html_content, 'html.parser', parse_only=_SEMANTIC_STRAINER)
     
     # First pass: Extract all semantic elements
-    elements = []
-    for element in soup.find_all(['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'div', 'table']):
-        text = element.get_text().strip()
-        if not text:
-            continue
-            
-        if element.name in ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']:
-            element_type = 'heading'
-        elif element.name == 'table':
-            element_type = 'table'
-        else:
-            element_type = 'text'
-            
-        elements.append(SemanticElement(
-            type=element_type,
-            content=element,
-            text=text
-        ))
+    elements = list(iter_semantic_elements(soup))
     
     # Create document structure using the extracted elements
     document_structure = create_document_structure(elements)
@@ -153,6 +509,33 @@ def process_html(html_content: str, form_type: str = '10-K') -> Dict[str, Any]:
     
     return result
 
+def iter_semantic_elements(soup: BeautifulSoup) -> Iterator[SemanticElement]:
+    """Yield a semantic element for every non-empty heading, text block, or table.
+    
+    Only tables keep a reference to their tag; headings and text blocks carry just their text.
+    """
+    # A plain descendant walk with a set lookup is much cheaper than find_all's matcher
+    for element in soup.descendants:
+        if not isinstance(element, Tag) or element.name not in _SEMANTIC_TAGS:
+            continue
+        
+        text = element.get_text().strip()
+        if not text:
+            continue
+            
+        if element.name == 'table':
+            yield SemanticElement(type='table', content=element, text=text)
+        elif element.name in _HEADING_TAGS:
+            yield SemanticElement(type='heading', content=None, text=text)
+        else:
+            yield SemanticElement(type='text', content=None, text=text)
+
+def iter_text_elements(elements: List['SemanticElement']) -> Iterator[SemanticElement]:
+    """Yield the headings and text blocks, skipping tables."""
+    for element in elements:
+        if element.type != 'table' and element.text:
+            yield element
+
 def create_document_structure(elements: List['SemanticElement']) -> List[Dict]:
     """Create a nested structure of the document using the processed elements."""
     structure = []
@@ -161,11 +544,12 @@ def create_document_structure(elements: List['SemanticElement']) -> List[Dict]:
     
     for element in elements:
         # Skip navigation elements
-        if any(marker in element.text.lower() for marker in ['table of contents', 'next page', 'previous page']):
+        if _is_navigation_text(element.text_lower):
             continue
         
-        # Check if this is a part header
-        if re.match(r'^part\s+[iIvV]+$', element.text, re.IGNORECASE):
+        # Check if this is a part header; headers are rare, so a prefix test screens out
+        # most elements before the part and item regexes run
+        if element.text_lower.startswith('part') and _PART_RE.match(element.text):
             if current_part and current_items:
                 structure.append({
                     'title': current_part,
@@ -176,7 +560,7 @@ def create_document_structure(elements: List['SemanticElement']) -> List[Dict]:
             continue
         
         # Check if this is an item header
-        item_match = re.match(r'^item\s+(\d+[A-Z]?)\s*\.?\s*(.*)$', element.text, re.IGNORECASE)
+        item_match = _ITEM_RE.match(element.text) if element.text_lower.startswith('item') else None
         if item_match:
             item_number = item_match.group(1)
             item_title = item_match.group(2).strip()
@@ -219,16 +603,13 @@ def create_document_structure(elements: List['SemanticElement']) -> List[Dict]:
     
     return structure
 
-def find_section_content(elements: List['SemanticElement'], section_title: str) -> Dict:
-    """Find the content and subsections of a given section."""
-    logger.info(f"Finding content for section: {section_title}")
-    content = []
-    subsections = []
-    
+@lru_cache(maxsize=512)
+def _section_title_pattern(section_title: str) -> re.Pattern:
+    """Compile the pattern that locates a section header, once per title."""
     # Create regex pattern for the section
     # Handle both formats: "Item X. Title" and just "Title"
     if 'Item' in section_title:
-        item_number = re.search(r'Item\s+(\d+[A-Z]?)', section_title)
+        item_number = _ITEM_NUMBER_RE.search(section_title)
         if item_number:
             # Pattern for "Item X. Title" format
             pattern = re.compile(
@@ -238,6 +619,15 @@ def find_section_content(elements: List['SemanticElement'], section_title: str)
     else:
         # Pattern for just the title
         pattern = re.compile(re.escape(section_title), re.IGNORECASE | re.MULTILINE)
+    return pattern
+
+def find_section_content(elements: List['SemanticElement'], section_title: str) -> Dict:
+    """Find the content and subsections of a given section."""
+    logger.info("Finding content for section: %s", section_title)
+    content = []
+    subsections = []
+    
+    pattern = _section_title_pattern(section_title)
     
     # Find the section start
     section_start = None
@@ -247,29 +637,41 @@ def find_section_content(elements: List['SemanticElement'], section_title: str)
             break
     
     if section_start is None:
-        logger.warning(f"Could not find section header for: {section_title}")
+        logger.warning("Could not find section header for: %s", section_title)
         return {'content': [], 'subsections': []}
     
     # Find the next section start (look for next Item X pattern)
-    next_section_pattern = re.compile(r'Item\s+\d+[A-Z]?\s*\.', re.IGNORECASE | re.MULTILINE)
     section_end = None
     for i in range(section_start + 1, len(elements)):
-        if next_section_pattern.search(elements[i].text):
+        if _NEXT_SECTION_RE.search(elements[i].text):
             section_end = i
             break
     
     # Extract content between current section and next section
     section_elements = elements[section_start:section_end] if section_end else elements[section_start:]
     
-    # Process all elements in order
+    # Process all elements in order. Short and repeated paragraphs are filtered as they
+    # are collected, keyed by their whitespace-normalized text.
     current_subsection = None
+    current_title = None  # Whitespace-normalized title of the open subsection
+    current_has_text = False  # Whether the open subsection received any paragraph, kept or not
+    seen_content = set()
+    seen_subsection_content = set()
+    seen_titles = set()
+    
+    def close_subsection() -> None:
+        """Keep the open subsection unless it had no text, repeats a title, or lost all its paragraphs."""
+        if not current_has_text:
+            return
+        if current_title in seen_titles:
+            return
+        seen_titles.add(current_title)
+        if current_subsection['content']:
+            subsections.append(current_subsection)
     
     for element in section_elements:
         # Skip navigation elements and page headings
-        if any(marker in element.text.lower() for marker in [
-            'table of contents', 'next page', 'previous page',
-            'form 10-k', 'form 10-q', 'form 8-k', '|', 'page'
-        ]):
+        if _is_page_chrome(element.text_lower):
             continue
         
         # Get the text content
@@ -277,458 +679,222 @@ def find_section_content(elements: List['SemanticElement'], section_title: str)
         if not text:
             continue
         
-        # Skip very short text that's likely just formatting
-        if len(text.split()) < 3:
+        # Skip very short text that's likely just formatting; the one split serves every
+        # later length check and the whitespace normalization
+        words = text.split()
+        word_count = len(words)
+        if word_count < 3:
             continue
         
         # Check if this is a subsection header
         is_subsection = (
             element.type == 'heading' or
-            (len(text.split()) <= 6 and text.endswith(':')) or
-            re.match(r'^[A-Z][A-Za-z\s]{2,}[.:]', text) or
-            re.match(r'^[A-Z][A-Za-z\s]{2,}\s*$', text)  # Also match headers without punctuation
+            (word_count <= 6 and text.endswith(':')) or
+            _SUBSECTION_RE.match(text)
         )
         
         if is_subsection:
             # If we have a current subsection, add it to subsections
-            if current_subsection and current_subsection['content']:
-                subsections.append(current_subsection)
+            close_subsection()
             
             # Start a new subsection
             current_subsection = {
                 'title': text,
                 'content': []
             }
+            current_title = ' '.join(words)
+            current_has_text = False
+            seen_subsection_content = set()
         else:
             # Skip common elements we don't want
-            if not any(skip in text.lower() for skip in [
-                'forward-looking statement',
-                'table of contents',
-                'documents incorporated by reference',
-                'part ii',
-                'part iii',
-                'part iv'
-            ]):
+            if not any(skip in element.text_lower for skip in _CONTENT_SKIP_MARKERS):
                 # Clean up the text
-                text = re.sub(r'\s+', ' ', text)  # Normalize whitespace
-                text = text.strip()
+                text = ' '.join(words)  # Normalize whitespace
                 
-                # Add as regular text content
+                # Add as regular text content, dropping paragraphs of three words or fewer
+                # and repeats within the same subsection or top-level content
                 text_content = {
                     'type': 'text',
                     'content': text
                 }
                 
                 if current_subsection:
-                    current_subsection['content'].append(text_content)
-                else:
+                    current_has_text = True
+                    if word_count > 3 and text not in seen_subsection_content:
+                        seen_subsection_content.add(text)
+                        current_subsection['content'].append(text_content)
+                elif word_count > 3 and text not in seen_content:
+                    seen_content.add(text)
                     content.append(text_content)
     
     # Add the last subsection if it exists
-    if current_subsection and current_subsection['content']:
-        subsections.append(current_subsection)
-    
-    # Clean up content and subsections
-    # Remove very short or empty content
-    content = [c for c in content if len(c['content'].split()) > 3]
-    
-    # Remove duplicate paragraphs
-    unique_content = []
-    seen = set()
-    for c in content:
-        # Normalize text for comparison
-        normalized = ' '.join(c['content'].split())
-        if normalized not in seen:
-            seen.add(normalized)
-            unique_content.append(c)
-    
-    # Clean subsections
-    cleaned_subsections = []
-    seen_titles = set()
-    
-    for subsection in subsections:
-        # Skip empty subsections
-        if not subsection['content']:
-            continue
-        
-        # Normalize title
-        title = ' '.join(subsection['title'].split())
-        if title not in seen_titles:
-            seen_titles.add(title)
-            # Clean subsection content
-            subsection_content = []
-            seen_content = set()
-            for c in subsection['content']:
-                normalized = ' '.join(c['content'].split())
-                if normalized not in seen_content and len(normalized.split()) > 3:
-                    seen_content.add(normalized)
-                    subsection_content.append(c)
-            
-            if subsection_content:  # Only add if there's content after cleaning
-                subsection['content'] = subsection_content
-                cleaned_subsections.append(subsection)
+    if current_subsection:
+        close_subsection()
     
     # If we found no content, try a more aggressive approach
-    if not unique_content and not cleaned_subsections:
+    if not content and not subsections:
         logger.info("No content found with standard approach, trying aggressive extraction")
         # Try to find the section by looking for the title in the elements
         for element in section_elements:
             text = element.text.strip()
             if text and len(text.split()) > 3:
-                unique_content.append({
+                content.append({
                     'type': 'text',
                     'content': text
                 })
     
     return {
-        'content': unique_content,
-        'subsections': cleaned_subsections
+        'content': content,
+        'subsections': subsections
     }
 
+def iter_company_risks(elements: List['SemanticElement']) -> Iterator[RedFlag]:
+    """Yield investor-relevant risks in document order, flagging each context at most once."""
+    # Normalized contexts that have already been flagged: an exact-match set, one
+    # NUL-separated blob for the "new inside existing" test, and a length-sorted
+    # list for the "existing inside new" test. NUL never survives _normalize_text.
+    seen_contexts = set()
+    accepted_blob = ''
+    accepted_lengths = []
+    accepted_by_length = []
+    # Normalized text and polarity per context for this filing only; boilerplate repeats
+    # within a filing, and the app already caches whole results per filing
+    normalized_by_text = {}
+    polarity_by_context = {}
+    
+    def is_duplicate_or_contained(normalized_new: str) -> bool:
+        """Check if the normalized text is a duplicate or is contained within any existing normalized text."""
+        # Exact duplicates are the common case and need no substring scan
+        if normalized_new in seen_contexts or normalized_new in accepted_blob:
+            return True
+        # Only contexts no longer than the new one can be contained in it
+        shorter = bisect_right(accepted_lengths, len(normalized_new))
+        return any(normalized_existing in normalized_new
+                   for normalized_existing in accepted_by_length[:shorter])
+    
+    def accept_context(normalized_context: str) -> None:
+        """Record a flagged context for later duplicate checks."""
+        nonlocal accepted_blob
+        seen_contexts.add(normalized_context)
+        accepted_blob += '\0' + normalized_context
+        index = bisect_right(accepted_lengths, len(normalized_context))
+        accepted_lengths.insert(index, len(normalized_context))
+        accepted_by_length.insert(index, normalized_context)
+    
+    # Process all headings and text blocks for risks (tables carry no prose)
+    for element in iter_text_elements(elements):
+        text = element.text_lower
+        
+        # Get the full text as context
+        context = element.text.strip()
+        
+        # Skip short contexts before paying for the category scan
+        if len(context.split()) < 5:
+            continue
+        
+        # A context is flagged at most once, so one category match per element is enough
+        match = _match_risk_category(text)
+        if match is None:
+            continue
+        category, term = match
+        
+        # Skip if context is already processed
+        normalized_context = normalized_by_text.get(text)
+        if normalized_context is None:
+            normalized_context = normalized_by_text[text] = _normalize_text(text)
+        if is_duplicate_or_contained(normalized_context):
+            continue
+        
+        # Only flag if the context has negative sentiment
+        sentiment = polarity_by_context.get(context)
+        if sentiment is None:
+            sentiment = polarity_by_context[context] = _sentiment_polarity(context)
+        if sentiment < -0.2:  # More balanced threshold for negative sentiment
+            accept_context(normalized_context)
+            
+            # Determine severity based on sentiment and context
+            severity = 'High' if sentiment < -0.4 else 'Medium'  # More balanced threshold for High severity
+            
+            # Check for additional severity indicators
+            if any(indicator in text for indicator in _SEVERITY_INDICATORS):
+                severity = 'High'
+            
+            logger.info("Found %s risk in category %s: %s", severity, category, term)
+            yield RedFlag(
+                category=category,
+                description=f"Potential {category} risk related to {term}",
+                severity=severity,
+                context=context
+            )
+
 def analyze_company_risks(elements: List['SemanticElement']) -> Tuple[List[RedFlag], List[Dict]]:
     """Comprehensive analysis of company risks focusing on investor-relevant categories."""
     logger.info("Starting investor-focused risk analysis")
-    risks = []
-    processed_contexts = []
-    
-    # Define investor-relevant risk categories with specific terms and context requirements
-    risk_categories = {
-        'Major Lawsuits': {
-            'terms': [
-                # Active litigation
-                'lawsuit filed', 'litigation pending', 'ongoing litigation',
-                'current lawsuit', 'active litigation', 'pending lawsuit',
-                # Specific types
-                'securities class action filed', 'shareholder derivative filed',
-                'antitrust lawsuit filed', 'patent infringement filed',
-                'regulatory enforcement action', 'sec enforcement proceeding',
-                # Original terms
-                'securities class action', 'securities fraud', 'shareholder class action',
-                'stockholder derivative', 'securities violation', 'insider trading',
-                'securities litigation', 'securities claim', 'securities lawsuit',
-                'sec investigation', 'sec enforcement', 'regulatory investigation',
-                'regulatory action', 'enforcement proceeding', 'regulatory violation',
-                'compliance issue', 'regulatory penalty', 'regulatory fine',
-                'regulatory settlement', 'regulatory order', 'regulatory finding',
-                'antitrust investigation', 'antitrust lawsuit', 'monopoly',
-                'anti-competitive', 'price fixing', 'market allocation',
-                'antitrust violation', 'competition law', 'market power',
-                'material litigation', 'significant lawsuit', 'major legal proceeding',
-                'substantial claim', 'material claim', 'material legal matter',
-                'legal proceeding', 'lawsuit', 'litigation', 'legal action',
-                'class action', 'breach of contract', 'dispute', 'arbitration'
-            ],
-            'required_context': [
-                'filed', 'pending', 'ongoing', 'current', 'active',
-                'material', 'significant', 'substantial', 'major',
-                'damages', 'penalty', 'fine', 'settlement', 'judgment',
-                'adverse', 'negative', 'unfavorable', 'damages',
-                'penalty', 'fine', 'settlement', 'judgment',
-                'could', 'may', 'might', 'will', 'would', 'should'
-            ]
-        },
-        'Auditor Opinions': {
-            'terms': [
-                # Adverse opinions
-                'adverse opinion', 'qualified opinion', 'going concern',
-                'material weakness', 'significant deficiency', 'internal control',
-                'accounting irregularity', 'restatement', 'material misstatement',
-                'audit committee', 'independent auditor', 'audit opinion',
-                'audit report', 'auditor resignation', 'auditor change',
-                'internal control', 'financial reporting', 'accounting policy',
-                'accounting estimate', 'accounting principle', 'accounting standard',
-                'financial statement', 'financial reporting', 'financial control'
-            ],
-            'required_context': [
-                'adverse', 'qualified', 'material weakness', 'significant deficiency',
-                'going concern', 'restatement', 'irregularity', 'resignation',
-                'change', 'replacement', 'termination', 'dismissal',
-                'could', 'may', 'might', 'will', 'would', 'should'
-            ]
-        },
-        'Management Changes': {
-            'terms': [
-                # Executive departures
-                'ceo departure', 'cfo departure', 'chief executive officer',
-                'chief financial officer', 'executive officer', 'key executive',
-                'executive departure', 'executive resignation', 'executive termination',
-                'executive change', 'executive transition', 'executive succession',
-                # Board changes
-                'board member', 'director resignation', 'board resignation',
-                'independent director', 'audit committee member', 'board change',
-                'board transition', 'board succession', 'board departure',
-                # Management structure
-                'management change', 'leadership change', 'organizational change',
-                'reporting structure', 'management team', 'executive team',
-                'management transition', 'leadership transition', 'organizational transition',
-                # Termination indicators
-                'termination', 'resignation', 'departure', 'separation',
-                'for cause', 'without cause', 'good reason', 'constructive termination'
-            ],
-            'required_context': [
-                'resignation', 'departure', 'termination', 'separation',
-                'change', 'replacement', 'succession', 'transition',
-                'interim', 'temporary', 'acting', 'permanent',
-                'could', 'may', 'might', 'will', 'would', 'should'
-            ]
-        },
-        'Cybersecurity & Data Privacy': {
-            'terms': [
-                # Security incidents
-                'data breach', 'security breach', 'cyber attack',
-                'hacking incident', 'unauthorized access', 'data theft',
-                # Privacy issues
-                'privacy violation', 'data privacy', 'personal information',
-                'customer data', 'user data', 'member data',
-                # System issues
-                'system failure', 'service disruption', 'outage',
-                'system compromise', 'security vulnerability'
-            ],
-            'required_context': [
-                'material', 'significant', 'substantial', 'major',
-                'adverse', 'negative', 'unfavorable', 'damage',
-                'impact', 'effect', 'consequence', 'result'
-            ]
-        },
-        'Related Party Transactions': {
-            'terms': [
-                # Explicit relationships
-                'related party transaction', 'related person transaction',
-                'insider transaction', 'executive transaction',
-                'director transaction', 'board member transaction',
-                # Specific relationships
-                'family member', 'immediate family', 'close family',
-                'executive', 'director', 'officer', 'board member',
-                'key employee', 'principal shareholder',
-                # Original terms
-                'affiliate transaction', 'insider transaction', 'executive transaction',
-                'director transaction', 'board member transaction', 'officer transaction',
-                'related party', 'related person', 'affiliate', 'insider',
-                'business relationship', 'personal relationship', 'financial relationship',
-                'family relationship', 'personal interest', 'business interest',
-                'purchase', 'sale', 'lease', 'loan', 'guarantee',
-                'indemnification', 'compensation', 'benefit', 'arrangement',
-                'transaction', 'agreement', 'contract', 'arrangement'
-            ],
-            'required_context': [
-                'material', 'significant', 'substantial', 'major',
-                'unusual', 'non-arm\'s length', 'conflict of interest',
-                'independence', 'approval', 'review', 'disclosure',
-                'transaction', 'agreement', 'contract', 'arrangement',
-                'could', 'may', 'might', 'will', 'would', 'should',
-                'related party', 'related person', 'affiliate', 'insider',
-                'family member', 'executive', 'director', 'officer',
-                'board member', 'key employee', 'principal shareholder'
-            ]
-        },
-        'Financial Performance': {
-            'terms': [
-                # Revenue issues
-                'revenue decline', 'sales decline', 'profit decline',
-                'earnings decline', 'income decline', 'margin erosion',
-                # Financial problems
-                'loss', 'deficit', 'impairment', 'write-down',
-                'write-off', 'restructuring charge', 'goodwill impairment',
-                # Liquidity issues
-                'liquidity', 'working capital', 'cash flow',
-                'debt covenant', 'credit facility', 'borrowing base',
-                # Original terms
-                'profit margin', 'gross margin', 'operating margin',
-                'revenue', 'sales', 'profit', 'earnings', 'income',
-                'margin', 'profitability', 'earnings per share',
-                'cash', 'liquidity', 'working capital', 'capital',
-                'debt', 'credit', 'borrowing', 'financing',
-                'material change', 'significant change', 'substantial change',
-                'material impact', 'significant impact', 'substantial impact',
-                'change', 'impact', 'effect', 'influence', 'consequence',
-                'impairment', 'write-down', 'write-off', 'restructuring'
-            ],
-            'required_context': [
-                'material', 'significant', 'substantial', 'major',
-                'adverse', 'negative', 'unfavorable', 'decline',
-                'decrease', 'reduction', 'deterioration', 'weakening',
-                'percent', '%', 'million', 'billion', 'dollar',
-                'could', 'may', 'might', 'will', 'would', 'should'
-            ]
-        },
-        'Competition': {
-            'terms': [
-                # Market position
-                'market share loss', 'competitive position loss',
-                'market position loss', 'competitive disadvantage',
-                # Customer impact
-                'customer loss', 'customer defection', 'customer retention',
-                'customer concentration', 'key customer loss',
-                # Product issues
-                'product obsolescence', 'technological change',
-                'disruptive technology', 'new entrant', 'substitute product',
-                # Original terms
-                'market share', 'competitive position', 'market position',
-                'competitive pressure', 'pricing pressure', 'market competition',
-                'market', 'competition', 'competitive', 'pricing',
-                'customer', 'client', 'buyer', 'purchaser', 'consumer',
-                'customer base', 'customer relationship', 'customer service',
-                'product', 'technology', 'innovation', 'development',
-                'research', 'r&d', 'patent', 'intellectual property',
-                'industry change', 'market change', 'competitive landscape',
-                'competitive environment', 'market disruption', 'industry disruption',
-                'industry', 'market', 'sector', 'business', 'commercial'
-            ],
-            'required_context': [
-                'material', 'significant', 'substantial', 'major',
-                'adverse', 'negative', 'unfavorable', 'decline',
-                'decrease', 'reduction', 'deterioration', 'weakening',
-                'competitor', 'competition', 'competitive', 'market',
-                'could', 'may', 'might', 'will', 'would', 'should'
-            ]
+    high_risks = []
+    medium_risks = []
+    
+    # Per-category summary, filled in as risks are found
+    category_summaries = {
+        category: {
+            'category': category,
+            'high_severity_count': 0,
+            'medium_severity_count': 0,
+            'risks': []
         }
+        for category in _RISK_CATEGORIES
     }
     
-    def has_negative_sentiment(text: str) -> bool:
-        """Check if the text has negative sentiment with a more balanced threshold."""
-        sentiment = TextBlob(text).sentiment.polarity
-        return sentiment < -0.2  # More balanced threshold for negative sentiment
-    
-    def normalize_text(text: str) -> str:
-        """Normalize text for comparison by removing extra whitespace and punctuation."""
-        text = ' '.join(text.lower().split())
-        text = re.sub(r'[^\w\s\.]', '', text)
-        return text
-    
-    def is_duplicate_or_contained(new_text: str, existing_texts: List[str]) -> bool:
-        """Check if the new text is a duplicate or is contained within any existing text."""
-        normalized_new = normalize_text(new_text)
-        for existing in existing_texts:
-            normalized_existing = normalize_text(existing)
-            if normalized_new in normalized_existing or normalized_existing in normalized_new:
-                return True
-        return False
+    for risk in iter_company_risks(elements):
+        # Bucket by severity and tally the category summary as risks are found
+        category_summary = category_summaries[risk.category]
+        if risk.severity == 'High':
+            high_risks.append(risk)
+            category_summary['high_severity_count'] += 1
+        else:
+            medium_risks.append(risk)
+            category_summary['medium_severity_count'] += 1
+        category_summary['risks'].append(risk)
     
-    # Process all elements for risks
-    for element in elements:
-        # Skip empty elements and tables
-        if not element.text or element.type == 'table':
-            continue
-            
-        text = element.text.lower()
-        
-        # Process each category
-        for category, config in risk_categories.items():
-            for term in config['terms']:
-                if term in text:
-                    # Get the full text as context
-                    context = element.text.strip()
-                    
-                    # Skip if context is too short or already processed
-                    if len(context.split()) < 5 or is_duplicate_or_contained(context, processed_contexts):
-                        continue
-                    
-                    # Check for required context terms
-                    if not any(context_term in text for context_term in config['required_context']):
-                        continue
-                        
-                    # Only flag if the context has negative sentiment
-                    if has_negative_sentiment(context):
-                        processed_contexts.append(context)
-                        
-                        # Determine severity based on sentiment and context
-                        sentiment = TextBlob(context).sentiment.polarity
-                        severity = 'High' if sentiment < -0.4 else 'Medium'  # More balanced threshold for High severity
-                        
-                        # Check for additional severity indicators
-                        severity_indicators = [
-                            'material', 'significant', 'substantial', 'major',
-                            'critical', 'important', 'key', 'essential', 'fundamental',
-                            'adverse', 'serious', 'severe', 'material adverse effect',
-                            'could', 'may', 'might', 'will', 'would', 'should',
-                            'risk', 'uncertainty', 'challenge', 'threat', 'concern',
-                            'issue', 'problem', 'difficulty', 'obstacle', 'barrier'
-                        ]
-                        
-                        if any(indicator in text for indicator in severity_indicators):
-                            severity = 'High'
-                        
-                        risks.append(RedFlag(
-                            category=category,
-                            description=f"Potential {category} risk related to {term}",
-                            severity=severity,
-                            context=context
-                        ))
-                        logger.info(f"Found {severity} risk in category {category}: {term}")
-    
-    # Create summary by category
-    summary = []
-    for category in risk_categories.keys():
-        category_risks = [r for r in risks if r.category == category]
-        high_severity = len([r for r in category_risks if r.severity == 'High'])
-        medium_severity = len([r for r in category_risks if r.severity == 'Medium'])
-        
-        if category_risks:
-            summary.append({
-                'category': category,
-                'high_severity_count': high_severity,
-                'medium_severity_count': medium_severity,
-                'risks': category_risks
-            })
+    # Create summary by category, keeping only categories with risks
+    summary = [category_summary for category_summary in category_summaries.values() if category_summary['risks']]
     
-    # Sort risks by severity (High first, then Medium)
-    risks.sort(key=lambda x: 0 if x.severity == 'High' else 1)
+    # Order risks by severity (High first, then Medium), keeping discovery order within each
+    risks = high_risks + medium_risks
     
-    logger.info(f"Risk analysis complete. Found {len(risks)} risks across {len(summary)} categories")
+    logger.info("Risk analysis complete. Found %d risks across %d categories", len(risks), len(summary))
     return risks, summary
 
 def analyze_company_focus(elements: List['SemanticElement']) -> Dict[str, Any]:
-    """Analyze company focus areas using NLP techniques."""
-    from collections import Counter
-    import nltk
-    from nltk.tokenize import word_tokenize
-    from nltk.corpus import stopwords
-    
-    # Download required NLTK resources
-    try:
-        nltk.data.find('tokenizers/punkt')
-    except LookupError:
-        nltk.download('punkt')
-    try:
-        nltk.data.find('corpora/stopwords')
-    except LookupError:
-        nltk.download('stopwords')
-    try:
-        nltk.data.find('tokenizers/punkt_tab')
-    except LookupError:
-        nltk.download('punkt_tab')
-
-    # Define focus areas and their keywords
-    focus_areas = {
-        'Innovation': ['research', 'development', 'innovation', 'patent', 'technology', 'r&d'],
-        'Growth': ['growth', 'expansion', 'acquisition', 'market share', 'new market'],
-        'Efficiency': ['efficiency', 'cost reduction', 'optimization', 'productivity'],
-        'Sustainability': ['sustainability', 'environmental', 'green', 'carbon', 'renewable'],
-        'Customer Focus': ['customer', 'user', 'experience', 'satisfaction', 'service'],
-        'Financial': ['profit', 'margin', 'revenue', 'earnings', 'dividend', 'shareholder'],
-        'Risk': ['risk', 'uncertainty', 'challenge', 'threat', 'competition'],
-        'Regulatory': ['regulation', 'compliance', 'legal', 'policy', 'government']
-    }
-    
-    # Combine all text from elements
-    all_text = ' '.join(element.text for element in elements if element.text)
-    
-    # Tokenize and clean text
-    tokens = word_tokenize(all_text.lower())
-    stop_words = set(stopwords.words('english'))
-    tokens = [token for token in tokens if token.isalnum() and token not in stop_words]
-    
-    # Count word frequencies
-    word_counts = Counter(tokens)
+    """Analyze company focus areas using NLP techniques.
+    
+    An area's score is the number of occurrences of its keywords, where a phrase keyword such
+    as 'market share' counts once per occurrence. total_words counts word tokens only, and the
+    words inside a phrase are counted there as ordinary tokens. relative_score is therefore
+    keyword hits per word token (score / total_words), not a share of the words in the filing.
+    """
+    # Count word frequencies a batch of elements at a time so only one chunk of
+    # joined text is held alongside the elements, then clean the vocabulary once
+    # per distinct token rather than once per occurrence. NUL never occurs in element
+    # text, so neither a token nor a keyword phrase can span two elements.
+    word_counts = Counter()
+    phrase_counts = Counter()
+    texts = (element.text_lower for element in elements if element.text)
+    while chunk := '\0'.join(islice(texts, _FOCUS_CHUNK_SIZE)):
+        word_counts.update(_TOKEN_RE.findall(chunk))
+        phrase_counts.update(' '.join(phrase.split()) for phrase in _FOCUS_PHRASE_RE.findall(chunk))
+    for token in [token for token in word_counts if not token.isalnum() or token in _STOP_WORDS]:
+        del word_counts[token]
+    total_words = sum(word_counts.values())
     
     # Analyze focus areas
     focus_analysis = {}
-    for area, keywords in focus_areas.items():
-        score = sum(word_counts[word] for word in keywords)
+    for area, keywords in _FOCUS_AREAS.items():
+        key_terms = [word for word in keywords if word in word_counts or word in phrase_counts]
+        score = sum(word_counts[word] + phrase_counts[word] for word in key_terms)
         focus_analysis[area] = {
             'score': score,
-            'relative_score': score / len(tokens) if tokens else 0,
-            'key_terms': [word for word in keywords if word_counts[word] > 0]
+            'relative_score': score / total_words if total_words else 0,
+            'key_terms': key_terms
         }
     
     # Get top 10 most frequent terms
@@ -737,7 +903,7 @@ def analyze_company_focus(elements: List['SemanticElement']) -> Dict[str, Any]:
     return {
         'focus_areas': focus_analysis,
         'top_terms': top_terms,
-        'total_words': len(tokens)
+        'total_words': total_words
     }
 
 def display_document_structure(structure):
@@ -750,39 +916,38 @@ def display_document_structure(structure):
         return
     
     # Group parts by their title to avoid duplicates
-    grouped_parts = {}
+    grouped_parts = defaultdict(list)
     for part in structure:
-        if part['title'] not in grouped_parts:
-            grouped_parts[part['title']] = {
-                'title': part['title'],
-                'items': []
-            }
-        grouped_parts[part['title']]['items'].extend(part['items'])
+        grouped_parts[part['title']].extend(part['items'])
     
     # Create tabs for each unique part
-    part_tabs = st.tabs([part['title'] for part in grouped_parts.values()])
+    part_tabs = st.tabs(list(grouped_parts))
     
-    for part_tab, part in zip(part_tabs, grouped_parts.values()):
+    for part_tab, items in zip(part_tabs, grouped_parts.values()):
         with part_tab:
             # Display items in a single column for better readability
-            for item in part['items']:
+            for item in items:
                 with st.expander(f"📄 {item['title']}", expanded=False):
-                    # Display main content if any
+                    # Display main content if any, as one Markdown block with a blank
+                    # line between paragraphs so each item costs a single Streamlit call
                     if item['content']:
-                        for content in item['content']:
-                            if isinstance(content, dict) and content['type'] == 'text':
-                                st.write(content['content'])
-                                st.write("")  # Add spacing between paragraphs
+                        body = "\n\n".join(
+                            content['content'] for content in item['content']
+                            if content['type'] == 'text'  # Tables are not rendered here
+                        )
+                        if body:
+                            st.markdown(body)
                     
                     # Display subsections if any
                     if item['subsections']:
                         for subsection in item['subsections']:
                             with st.expander(f"📑 {subsection['title']}", expanded=False):
-                                # Add indentation for subsection content
-                                for content in subsection['content']:
-                                    if isinstance(content, dict) and content['type'] == 'text':
-                                        st.write("&nbsp;&nbsp;&nbsp;&nbsp;" + content['content'])
-                                        st.write("")  # Add spacing between paragraphs
+                                # Add indentation for subsection content (always text blocks)
+                                body = "\n\n".join(
+                                    "&nbsp;&nbsp;&nbsp;&nbsp;" + content['content'] for content in subsection['content']
+                                )
+                                if body:
+                                    st.markdown(body)
                     
                     if not item['content'] and not item['subsections']:
                         st.info("No content available for this section") 
\ No newline at end of file
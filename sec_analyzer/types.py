@@ -2,19 +2,24 @@
 Type definitions for the SEC analyzer.
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional, Any
 from bs4 import BeautifulSoup
 
-@dataclass
+@dataclass(slots=True)
 class SemanticElement:
     """Represents a semantic element in a document."""
     type: str
     content: Any
     text: str = ""
     parent: Optional['SemanticElement'] = None
+    text_lower: str = field(init=False, repr=False)
+    
+    def __post_init__(self):
+        # Cache the lowercased text once; every analysis pass matches against it
+        self.text_lower = self.text.lower()
 
-@dataclass
+@dataclass(slots=True)
 class RedFlag:
     """Represents a potential red flag found in a filing."""
     category: str